@@ -1,6 +1,24 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import chain
 import json
+import re
+import socket
+import sys
+import time
 from pathlib import Path
-from typing import Dict, List, Callable, NamedTuple, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from urllib.parse import urljoin
 import warnings
 
@@ -15,12 +33,88 @@ from django_vite.core.exceptions import (
 )
 from django_vite.core.tag_generator import Tag, TagGenerator, attrs_to_str
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 DEFAULT_APP_NAME = "default"
 DEBUG = False
 
+# Default attributes of the generated tags. They must never be mutated, since
+# they are shared between every render.
+_DEV_SCRIPT_ATTRS: Dict[str, str] = {"type": "module"}
+_MODULE_SCRIPT_ATTRS: Dict[str, str] = {"type": "module", "crossorigin": ""}
+_LEGACY_SCRIPT_ATTRS: Dict[str, str] = {"nomodule": "", "crossorigin": ""}
+_MODULEPRELOAD_ATTRS: Dict[str, str] = {
+    "type": "text/javascript",
+    "crossorigin": "anonymous",
+    "rel": "modulepreload",
+    "as": "script",
+}
+
+# The tags rendered with those default attributes, with a "{}" placeholder for
+# the URL, so the common case of a template tag without kwargs skips
+# attrs_to_str entirely.
+_DEV_SCRIPT_TEMPLATE = TagGenerator.script("{}", attrs=_DEV_SCRIPT_ATTRS)
+_MODULE_SCRIPT_TEMPLATE = TagGenerator.script("{}", attrs=_MODULE_SCRIPT_ATTRS)
+_LEGACY_SCRIPT_TEMPLATE = TagGenerator.script("{}", attrs=_LEGACY_SCRIPT_ATTRS)
+_MODULEPRELOAD_TEMPLATE = TagGenerator.preload("{}", attrs=_MODULEPRELOAD_ATTRS)
+
+# Preamble of @vitejs/plugin-react, rendered by generate_vite_react_refresh_url.
+_REACT_REFRESH_TEMPLATE = """<script type="module" {attrs}>
+            import RefreshRuntime from '{url}'
+            RefreshRuntime.injectIntoGlobalHook(window)
+            window.$RefreshReg$ = () => {{}}
+            window.$RefreshSig$ = () => (type) => type
+            window.__vite_plugin_react_preamble_installed__ = true
+        </script>"""
+
+# Relative paths which urljoin would append to a base URL unchanged.
+_PLAIN_RELATIVE_PATH = re.compile(r"[\w@+~%-][\w@+~%./-]*", re.ASCII)
+
+
 def print_debug(msg, always_show=False):
     if DEBUG or always_show: print(f"[django-vite] {msg}")
 
+
+# How long (in seconds) the result of probing the vite webserver is trusted.
+VITE_IS_SERVING_TTL = 1.0
+
+# How long (in seconds) to wait for the vite webserver to accept a connection.
+VITE_PROBE_TIMEOUT = 0.1
+
+_vite_is_serving_cache: Dict[Tuple[str, int], Tuple[float, bool]] = {}
+
+# requests is only needed for remote manifests, so it is imported on first use
+# instead of at module import.
+_requests = None
+
+
+def _get_requests():
+    global _requests
+    if _requests is None:
+        import requests
+
+        _requests = requests
+    return _requests
+
+
+def _probe_vite_server(config: "DjangoViteConfig") -> bool:
+    # Check that something accepts connections on the vite webserver's port
+    try:
+        connection = socket.create_connection(
+            (config.dev_server_host, config.dev_server_port),
+            timeout=VITE_PROBE_TIMEOUT,
+        )
+    except OSError:
+        return False
+    connection.close()
+    return True
+
+
 def vite_is_serving(config: "DjangoViteConfig") -> bool:
     """
     ====
@@ -29,38 +123,37 @@ def vite_is_serving(config: "DjangoViteConfig") -> bool:
     ====
     When "dev mode" was false to begin with, this means that we're running in prod and should never
     check for a running vite webserver instance to begin with
+    ====
+    The probe result is cached per (host, port) for VITE_IS_SERVING_TTL seconds, so
+    rendering a page with many vite tags only hits the webserver once.
     """
     if config.dev_mode:
         print_debug("Evaluating devmode...")
-        # Hacky way to check if the vite webserver is serving something
-        import requests
-        from requests.adapters import HTTPAdapter
-        import urllib3
-        vite_webserver_url = f"http://{config.dev_server_host}:{config.dev_server_port}/"
-        try:
-            session = requests.Session()
-            session.mount(vite_webserver_url, HTTPAdapter(max_retries=0))
-            response = session.get(vite_webserver_url)
-            return response.status_code == 404
-        except urllib3.exceptions.MaxRetryError:
-            return False
-        except requests.exceptions.ConnectionError:
-            return False
+        key = (config.dev_server_host, config.dev_server_port)
+        now = time.monotonic()
+        cached = _vite_is_serving_cache.get(key)
+        if cached is not None and now - cached[0] < VITE_IS_SERVING_TTL:
+            return cached[1]
+        is_serving = _probe_vite_server(config)
+        _vite_is_serving_cache[key] = (now, is_serving)
+        return is_serving
     else:
         return False
 
-def open_manifest(path_to_manifest):
+
+def open_manifest(path_to_manifest) -> bytes:
+    """
+    Read the raw content of the manifest, from disk or else over HTTP.
+    """
     try:
-        return open(path_to_manifest, "r")
+        with open(path_to_manifest, "rb") as manifest_file:
+            return manifest_file.read()
     except Exception as e:
         print_debug(f"Failed to open relative manifest [{path_to_manifest}], try fallback...", always_show=True)
 
-    import io
-    import requests
-    response = requests.get(path_to_manifest)
+    response = _get_requests().get(path_to_manifest)
     response.raise_for_status()
-    manifest_file = io.StringIO(response.text)
-    return manifest_file
+    return response.content
 
 
 class DjangoViteConfig(NamedTuple):
@@ -96,7 +189,12 @@ class DjangoViteConfig(NamedTuple):
     react_refresh_url: str = "@react-refresh"
 
 
-class ManifestEntry(NamedTuple):
+# __slots__ support in dataclasses is only available from Python 3.10.
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class ManifestEntry:
     """
     Represent an entry for a file inside the "manifest.json".
     """
@@ -105,9 +203,16 @@ class ManifestEntry(NamedTuple):
     src: Optional[str] = None
     isEntry: Optional[bool] = False
     isDynamicEntry: Optional[bool] = False
-    css: Optional[List[str]] = []
-    imports: Optional[List[str]] = []
-    dynamicImports: Optional[List[str]] = []
+    css: Optional[List[str]] = field(default_factory=list)
+    imports: Optional[List[str]] = field(default_factory=list)
+    dynamicImports: Optional[List[str]] = field(default_factory=list)
+    # URL of file, resolved once by the ManifestClient's url_resolver.
+    # When not given, it defaults to the file path itself.
+    resolved_file_url: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.resolved_file_url is None:
+            object.__setattr__(self, "resolved_file_url", self.file)
 
 
 class ManifestClient:
@@ -120,24 +225,35 @@ class ManifestClient:
     """
 
     def __init__(
-        self, config: DjangoViteConfig, app_name: str = DEFAULT_APP_NAME
+        self,
+        config: DjangoViteConfig,
+        app_name: str = DEFAULT_APP_NAME,
+        url_resolver: Optional[Callable[[str], str]] = None,
     ) -> None:
         self._config = config
         self.app_name = app_name
+        # Turns paths from the manifest into URLs, see
+        # ManifestEntry.resolved_file_url. Without a resolver, the paths are used as
+        # URLs as they are.
+        self._url_resolver = url_resolver
 
         self.dev_mode = config.dev_mode if config.dev_mode and vite_is_serving(self._config) else False
         self.manifest_path = self._clean_manifest_path()
+        # Used in error messages.
+        self._manifest_path_str = str(self.manifest_path)
         self.legacy_polyfills_motif = config.legacy_polyfills_motif
 
+        # Raw manifest data, turned into ManifestEntry lazily by get().
+        self._raw_entries: Dict[str, Dict[str, Any]] = {}
         self._entries: Dict[str, ManifestEntry] = {}
-        self.legacy_polyfills_entry: Optional[ManifestEntry] = None
+        self.legacy_polyfills_path: Optional[str] = None
 
         # Don't crash if there is an error while parsing manifest.json.
         # Running DjangoViteAssetLoader.instance().checks() on startup will log any
         # errors.
         if not self.dev_mode:
             try:
-                self._entries, self.legacy_polyfills_entry = self._parse_manifest()
+                self._raw_entries, self.legacy_polyfills_path = self._parse_manifest()
             except DjangoViteManifestError:
                 pass
 
@@ -157,7 +273,9 @@ class ManifestClient:
                 / self._config.static_url_prefix
                 / "manifest.json"
             )
-        elif not isinstance(initial_manifest_path, Path) and not initial_manifest_path.startswith("http"):
+        elif not isinstance(
+            initial_manifest_path, Path
+        ) and not initial_manifest_path.startswith(("http://", "https://")):
             return Path(initial_manifest_path)
         else:
             return initial_manifest_path
@@ -182,20 +300,23 @@ class ManifestClient:
             ]
 
     class ParsedManifestOutput(NamedTuple):
-        # all entries within the manifest
-        entries: Dict[str, ManifestEntry] = {}
-        # The manifest entry for legacy polyfills, if it exists within the manifest
-        legacy_polyfills_entry: Optional[ManifestEntry] = None
+        # raw data of all entries within the manifest, keyed by path
+        raw_entries: Dict[str, Dict[str, Any]] = {}
+        # The path of the legacy polyfills, if it exists within the manifest
+        legacy_polyfills_path: Optional[str] = None
 
     def _parse_manifest(self) -> ParsedManifestOutput:
         """
         Read and parse the Vite manifest file.
+        Entries are kept as raw JSON data and only turned into ManifestEntry
+        when requested through get().
 
         Returns:
-            entries {Dict[str, ManifestEntry]} -- All entries within the manifest
+            raw_entries {Dict[str, Dict[str, Any]]} -- Raw data of all entries
+                within the manifest
 
-            legacy_polyfills_entry {ManifestEntry} -- The manifest entry for legacy
-                polyfills, if it exists within the manifest.json
+            legacy_polyfills_path {str} -- The path of the legacy polyfills,
+                if it exists within the manifest.json
 
         Raises:
             DjangoViteManifestError: if cannot load the file or JSON in file is
@@ -204,33 +325,58 @@ class ManifestClient:
         if self.dev_mode:
             return self.ParsedManifestOutput()
 
-        entries: Dict[str, ManifestEntry] = {}
-        legacy_polyfills_entry: Optional[ManifestEntry] = None
+        legacy_polyfills_path: Optional[str] = None
 
         try:
-            with open_manifest(self.manifest_path) as manifest_file:
-                manifest_content = manifest_file.read()
-                manifest_json = json.loads(manifest_content)
-
-                for path, manifest_entry_data in manifest_json.items():
-                    filtered_manifest_entry_data = {
-                        key: value
-                        for key, value in manifest_entry_data.items()
-                        if key in ManifestEntry._fields
-                    }
-                    manifest_entry = ManifestEntry(**filtered_manifest_entry_data)
-                    entries[path] = manifest_entry
-                    if self.legacy_polyfills_motif in path:
-                        legacy_polyfills_entry = manifest_entry
-
-                return self.ParsedManifestOutput(entries, legacy_polyfills_entry)
+            manifest_json = _json_loads(open_manifest(self.manifest_path))
+            if not isinstance(manifest_json, dict):
+                raise ValueError("the manifest must be a JSON object")
+
+            for path, manifest_entry_data in manifest_json.items():
+                # Entries are only built by get(), but check their shape now so
+                # that malformed manifests are still reported on startup.
+                if (
+                    not isinstance(manifest_entry_data, dict)
+                    or "file" not in manifest_entry_data
+                ):
+                    raise ValueError(f'entry {path} has no "file"')
+                if self.legacy_polyfills_motif in path:
+                    legacy_polyfills_path = path
+
+            return self.ParsedManifestOutput(manifest_json, legacy_polyfills_path)
 
         except Exception as error:
             raise DjangoViteManifestError(
                 f"Cannot read Vite manifest file for app {self.app_name} at "
-                f"{self.manifest_path} : {str(error)}"
+                f"{self._manifest_path_str} : {str(error)}"
             ) from error
 
+    @property
+    def legacy_polyfills_entry(self) -> Optional[ManifestEntry]:
+        """The manifest entry for legacy polyfills, if it exists within the manifest"""
+        if self.legacy_polyfills_path is None:
+            return None
+        return self.get(self.legacy_polyfills_path)
+
+    @staticmethod
+    def _make_entry(
+        manifest_entry_data: Dict[str, Any], resolved_file_url: Optional[str] = None
+    ) -> ManifestEntry:
+        """
+        Build a ManifestEntry from the raw JSON data of a manifest entry.
+        """
+        get = manifest_entry_data.get
+        return ManifestEntry(
+            file=manifest_entry_data["file"],
+            src=get("src"),
+            isEntry=get("isEntry", False),
+            isDynamicEntry=get("isDynamicEntry", False),
+            css=get("css", []),
+            imports=get("imports", []),
+            dynamicImports=get("dynamicImports", []),
+            resolved_file_url=resolved_file_url,
+        )
+
     def get(self, path: str) -> ManifestEntry:
         """
         Gets the manifest_entry for given path.
@@ -241,14 +387,37 @@ class ManifestClient:
         Raises:
             DjangoViteAssetNotFoundError: if cannot find the file path in the manifest
                 or if manifest was never parsed due to dev_mode=True.
+            DjangoViteManifestError: if the entry for the file path is malformed.
+
+            Errors of the url_resolver (e.g. a file missing from the staticfiles
+            manifest) are not caught, and the entry is not memoized.
         """
-        if path not in self._entries:
+        manifest_entry = self._entries.get(path)
+        if manifest_entry is not None:
+            return manifest_entry
+
+        if path not in self._raw_entries:
             raise DjangoViteAssetNotFoundError(
                 f"Cannot find {path} for app={self.app_name} in Vite manifest at "
-                f"{self.manifest_path}"
+                f"{self._manifest_path_str}"
             )
 
-        return self._entries[path]
+        manifest_entry_data = self._raw_entries[path]
+        resolved_file_url = None
+        if self._url_resolver is not None:
+            # _parse_manifest already checked that every entry has a "file".
+            resolved_file_url = self._url_resolver(manifest_entry_data["file"])
+
+        try:
+            manifest_entry = self._make_entry(manifest_entry_data, resolved_file_url)
+        except (AttributeError, KeyError, TypeError) as error:
+            raise DjangoViteManifestError(
+                f"Cannot read entry {path} of Vite manifest file for app "
+                f"{self.app_name} at {self._manifest_path_str} : {str(error)}"
+            ) from error
+
+        self._entries[path] = manifest_entry
+        return manifest_entry
 
 
 class DjangoViteAppClient:
@@ -270,7 +439,45 @@ class DjangoViteAppClient:
         self.ws_client_url = config.ws_client_url
         self.react_refresh_url = config.react_refresh_url
 
-        self.manifest = ManifestClient(config, app_name)
+        self._dev_server_origin = (
+            f"{self.dev_server_protocol}://"
+            f"{self.dev_server_host}:{self.dev_server_port}"
+        )
+        self._static_url_base = self._get_static_url_base()
+        self._dev_server_url_base = urljoin(
+            self._dev_server_origin, self._static_url_base
+        )
+        self._dev_server_url_base_is_plain = not any(
+            char in self._dev_server_url_base for char in "?#;"
+        )
+        self._production_url_prefix = self.static_url_prefix
+        if self._production_url_prefix and not self._production_url_prefix.endswith(
+            "/"
+        ):
+            self._production_url_prefix += "/"
+
+        self._staticfiles_installed = apps.is_installed("django.contrib.staticfiles")
+        self._production_server_urls: Dict[str, str] = {}
+
+        self.manifest = ManifestClient(
+            config, app_name, url_resolver=self._get_production_server_url
+        )
+
+    def _get_static_url_base(self) -> str:
+        """
+        Generates the base path of the assets served by the Vite development
+        server. It only depends on the config, so it is computed once.
+
+        Returns:
+            str -- Base path, always ending with a "/".
+        """
+        ## Override to allow non-Django served local static files (like with Nginx)
+        ##   this can be an actual url (localhost:port) and not a relative path
+        static_url_base = urljoin("", self.static_url_prefix)
+        if not static_url_base.endswith("/"):
+            static_url_base += "/"
+
+        return static_url_base
 
     def _get_dev_server_url(
         self,
@@ -285,25 +492,23 @@ class DjangoViteAppClient:
         Returns:
             str -- Full URL to the asset.
         """
-        static_url_base = urljoin(settings.STATIC_URL, self.static_url_prefix)
-        if not static_url_base.endswith("/"):
-            static_url_base += "/"
-
-        ## Override to allow non-Django served local static files (like with Nginx)
-        ##   this can be an actual url (localhost:port) and not a relative path
-        static_url_base = urljoin('', self.static_url_prefix)
-        if not static_url_base.endswith("/"):
-            static_url_base += "/"
-
-        return urljoin(
-            f"{self.dev_server_protocol}://"
-            f"{self.dev_server_host}:{self.dev_server_port}",
-            urljoin(static_url_base, path),
-        )
+        # Plain relative paths can be appended as-is, anything else (absolute
+        # paths, schemes, queries, "." or empty segments, whitespace...) still
+        # needs to be resolved by urljoin.
+        if (
+            self._dev_server_url_base_is_plain
+            and _PLAIN_RELATIVE_PATH.fullmatch(path)
+            and "/." not in path
+            and "//" not in path
+        ):
+            return self._dev_server_url_base + path
+        return urljoin(self._dev_server_origin, urljoin(self._static_url_base, path))
 
     def _get_production_server_url(self, path: str) -> str:
         """
         Generates an URL to an asset served during production.
+        URLs are memoized per path, since they don't change once the
+        static files are collected.
 
         Keyword Arguments:
             path {str} -- Path to the asset.
@@ -312,17 +517,19 @@ class DjangoViteAppClient:
             str -- Full URL to the asset.
         """
 
+        if path in self._production_server_urls:
+            return self._production_server_urls[path]
+
         production_server_url = path
-        if prefix := self.static_url_prefix:
-            if not prefix.endswith("/"):
-                prefix += "/"
-            production_server_url = urljoin(prefix, path)
+        if self._production_url_prefix:
+            production_server_url = urljoin(self._production_url_prefix, path)
 
-        if apps.is_installed("django.contrib.staticfiles"):
+        if self._staticfiles_installed:
             from django.contrib.staticfiles.storage import staticfiles_storage
 
-            return staticfiles_storage.url(production_server_url)
+            production_server_url = staticfiles_storage.url(production_server_url)
 
+        self._production_server_urls[path] = production_server_url
         return production_server_url
 
     def generate_vite_asset(
@@ -354,47 +561,34 @@ class DjangoViteAppClient:
 
         if vite_is_serving(self._config):
             url = self._get_dev_server_url(path)
-            return TagGenerator.script(
-                url,
-                attrs={"type": "module", **kwargs},
-            )
+            if kwargs:
+                return TagGenerator.script(
+                    url,
+                    attrs={**_DEV_SCRIPT_ATTRS, **kwargs},
+                )
+            return _DEV_SCRIPT_TEMPLATE.format(url)
 
-        tags: List[Tag] = []
         manifest_entry = self.manifest.get(path)
-        scripts_attrs = {"type": "module", "crossorigin": "", **kwargs}
-
-        # Add dependent CSS
-        tags.extend(self._load_css_files_of_asset(path))
 
         # Add the script by itself
-        url = self._get_production_server_url(manifest_entry.file)
-        tags.append(
-            TagGenerator.script(
+        url = manifest_entry.resolved_file_url
+        if kwargs:
+            script_tag = TagGenerator.script(
                 url,
-                attrs=scripts_attrs,
+                attrs={**_MODULE_SCRIPT_ATTRS, **kwargs},
             )
-        )
-
-        # Preload imports
-        preload_attrs = {
-            "type": "text/javascript",
-            "crossorigin": "anonymous",
-            "rel": "modulepreload",
-            "as": "script",
-        }
-
-        for dep in manifest_entry.imports:
-            dep_manifest_entry = self.manifest.get(dep)
-            dep_file = dep_manifest_entry.file
-            url = self._get_production_server_url(dep_file)
-            tags.append(
-                TagGenerator.preload(
-                    url,
-                    attrs=preload_attrs,
-                )
+        else:
+            script_tag = _MODULE_SCRIPT_TEMPLATE.format(url)
+
+        return "\n".join(
+            chain(
+                # Add dependent CSS
+                self._load_css_files_of_asset(path, manifest_entry),
+                (script_tag,),
+                # Preload imports
+                self._preload_imports_of_asset(manifest_entry),
             )
-
-        return "\n".join(tags)
+        )
 
     def preload_vite_asset(
         self,
@@ -420,103 +614,95 @@ class DjangoViteAppClient:
         if vite_is_serving(self._config):
             return ""
 
-        tags: List[Tag] = []
         manifest_entry = self.manifest.get(path)
 
-        # Add the script by itself
-        script_attrs = {
-            "type": "text/javascript",
-            "crossorigin": "anonymous",
-            "rel": "modulepreload",
-            "as": "script",
-        }
-
-        manifest_file = manifest_entry.file
-        url = self._get_production_server_url(manifest_file)
-        tags.append(
-            TagGenerator.preload(
-                url,
-                attrs=script_attrs,
+        return "\n".join(
+            chain(
+                # Add the script by itself
+                (_MODULEPRELOAD_TEMPLATE.format(manifest_entry.resolved_file_url),),
+                # Add dependent CSS
+                self._preload_css_files_of_asset(path, manifest_entry),
+                # Preload imports
+                self._preload_imports_of_asset(manifest_entry),
             )
         )
 
-        # Add dependent CSS
-        tags.extend(self._preload_css_files_of_asset(path))
-
-        # Preload imports
-        for dep in manifest_entry.imports:
-            dep_manifest_entry = self.manifest.get(dep)
-            dep_file = dep_manifest_entry.file
-            url = self._get_production_server_url(dep_file)
-            tags.append(
-                TagGenerator.preload(
-                    url,
-                    attrs=script_attrs,
-                )
-            )
-
-        return "\n".join(tags)
+    def _preload_imports_of_asset(
+        self,
+        manifest_entry: ManifestEntry,
+    ) -> Iterator[Tag]:
+        return (
+            _MODULEPRELOAD_TEMPLATE.format(self.manifest.get(dep).resolved_file_url)
+            for dep in manifest_entry.imports
+        )
 
     def _preload_css_files_of_asset(
         self,
         path: str,
-    ) -> List[Tag]:
+        manifest_entry: Optional[ManifestEntry] = None,
+    ) -> Iterator[Tag]:
         return self._generate_css_files_of_asset(
             path,
             tag_generator=TagGenerator.stylesheet_preload,
-        ).tags
+            manifest_entry=manifest_entry,
+        )
 
     def _load_css_files_of_asset(
         self,
         path: str,
-    ) -> List[Tag]:
+        manifest_entry: Optional[ManifestEntry] = None,
+    ) -> Iterator[Tag]:
         return self._generate_css_files_of_asset(
             path,
             tag_generator=TagGenerator.stylesheet,
-        ).tags
-
-    class GeneratedCssFilesOutput(NamedTuple):
-        # list of generated CSS tags
-        tags: List[Tag]
-        # list of already processed CSS tags
-        already_processed: List[str]
+            manifest_entry=manifest_entry,
+        )
 
     def _generate_css_files_of_asset(
         self,
         path: str,
-        already_processed: Optional[List[str]] = None,
+        already_processed: Optional[Set[str]] = None,
         tag_generator: Callable[[str], Tag] = TagGenerator.stylesheet,
-    ) -> GeneratedCssFilesOutput:
+        visited_imports: Optional[Set[str]] = None,
+        manifest_entry: Optional[ManifestEntry] = None,
+    ) -> Iterator[Tag]:
         """
         Generates all CSS tags for dependencies of an asset.
 
         Arguments:
             path {str} -- Path to an asset in the 'manifest.json'.
             config_key {str} -- Key of the configuration to use.
-            already_processed {list} -- List of already processed CSS file.
-
-        Returns:
-            tags -- List of CSS tags.
-            already_processed -- List of already processed css paths
+            already_processed {set} -- Set of already processed CSS file.
+            visited_imports {set} -- Set of already visited assets, so that
+                shared imports are only walked once.
+            manifest_entry {ManifestEntry} -- The entry of path, if the caller
+                already looked it up.
+
+        Yields:
+            Tag -- CSS tags, in dependency order.
         """
         if already_processed is None:
-            already_processed = []
-        tags: List[Tag] = []
-        manifest_entry = self.manifest.get(path)
+            already_processed = set()
+        if visited_imports is None:
+            visited_imports = set()
+
+        if path in visited_imports:
+            return
+        visited_imports.add(path)
+
+        if manifest_entry is None:
+            manifest_entry = self.manifest.get(path)
 
         for import_path in manifest_entry.imports:
-            new_tags, _ = self._generate_css_files_of_asset(
-                import_path, already_processed, tag_generator
+            yield from self._generate_css_files_of_asset(
+                import_path, already_processed, tag_generator, visited_imports
             )
-            tags.extend(new_tags)
 
         for css_path in manifest_entry.css:
             if css_path not in already_processed:
+                already_processed.add(css_path)
                 url = self._get_production_server_url(css_path)
-                tags.append(tag_generator(url))
-                already_processed.append(css_path)
-
-        return self.GeneratedCssFilesOutput(tags, already_processed)
+                yield tag_generator(url)
 
     def generate_vite_asset_url(self, path: str) -> str:
         """
@@ -535,7 +721,7 @@ class DjangoViteAppClient:
 
         manifest_entry = self.manifest.get(path)
 
-        return self._get_production_server_url(manifest_entry.file)
+        return manifest_entry.resolved_file_url
 
     def generate_vite_legacy_polyfills(
         self,
@@ -567,16 +753,17 @@ class DjangoViteAppClient:
         if not polyfills_manifest_entry:
             raise DjangoViteAssetNotFoundError(
                 f"Vite legacy polyfills not found in manifest "
-                f"at {self.manifest.manifest_path}"
+                f"at {self.manifest._manifest_path_str}"
             )
 
-        scripts_attrs = {"nomodule": "", "crossorigin": "", **kwargs}
-        url = self._get_production_server_url(polyfills_manifest_entry.file)
+        url = polyfills_manifest_entry.resolved_file_url
 
-        return TagGenerator.script(
-            url,
-            attrs=scripts_attrs,
-        )
+        if kwargs:
+            return TagGenerator.script(
+                url,
+                attrs={**_LEGACY_SCRIPT_ATTRS, **kwargs},
+            )
+        return _LEGACY_SCRIPT_TEMPLATE.format(url)
 
     def generate_vite_legacy_asset(
         self,
@@ -608,13 +795,14 @@ class DjangoViteAppClient:
             return ""
 
         manifest_entry = self.manifest.get(path)
-        scripts_attrs = {"nomodule": "", "crossorigin": "", **kwargs}
-        url = self._get_production_server_url(manifest_entry.file)
+        url = manifest_entry.resolved_file_url
 
-        return TagGenerator.script(
-            url,
-            attrs=scripts_attrs,
-        )
+        if kwargs:
+            return TagGenerator.script(
+                url,
+                attrs={**_LEGACY_SCRIPT_ATTRS, **kwargs},
+            )
+        return _LEGACY_SCRIPT_TEMPLATE.format(url)
 
     def generate_vite_ws_client(self, **kwargs: Dict[str, str]) -> str:
         """
@@ -635,10 +823,12 @@ class DjangoViteAppClient:
 
         url = self._get_dev_server_url(self.ws_client_url)
 
-        return TagGenerator.script(
-            url,
-            attrs={"type": "module", **kwargs},
-        )
+        if kwargs:
+            return TagGenerator.script(
+                url,
+                attrs={**_DEV_SCRIPT_ATTRS, **kwargs},
+            )
+        return _DEV_SCRIPT_TEMPLATE.format(url)
 
     def generate_vite_react_refresh_url(self, **kwargs: Dict[str, str]) -> str:
         """
@@ -659,15 +849,9 @@ class DjangoViteAppClient:
             return ""
 
         url = self._get_dev_server_url(self.react_refresh_url)
-        attrs_str = attrs_to_str(kwargs)
+        attrs_str = attrs_to_str(kwargs) if kwargs else ""
 
-        return f"""<script type="module" {attrs_str}>
-            import RefreshRuntime from '{url}'
-            RefreshRuntime.injectIntoGlobalHook(window)
-            window.$RefreshReg$ = () => {{}}
-            window.$RefreshSig$ = () => (type) => type
-            window.__vite_plugin_react_preamble_installed__ = true
-        </script>"""
+        return _REACT_REFRESH_TEMPLATE.format(attrs=attrs_str, url=url)
 
 
 class DjangoViteAssetLoader:
@@ -739,10 +923,28 @@ class DjangoViteAssetLoader:
         if not django_vite_settings:
             return
 
+        configs: List[Tuple[str, DjangoViteConfig]] = []
         for app_name, config in django_vite_settings.items():
             if not isinstance(config, DjangoViteConfig):
                 config = DjangoViteConfig(**config)
-            cls._instance._apps[app_name] = DjangoViteAppClient(config, app_name)
+            configs.append((app_name, config))
+
+        # Each client reads and parses its own manifest, so with several apps
+        # they are created concurrently to overlap their I/O.
+        if len(configs) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(configs))) as executor:
+                app_clients = list(
+                    executor.map(
+                        lambda item: DjangoViteAppClient(item[1], item[0]), configs
+                    )
+                )
+        else:
+            app_clients = [
+                DjangoViteAppClient(config, app_name) for app_name, config in configs
+            ]
+
+        for (app_name, _), app_client in zip(configs, app_clients):
+            cls._instance._apps[app_name] = app_client
 
     @classmethod
     def _apply_legacy_django_vite_settings(cls):
@@ -751,7 +953,7 @@ class DjangoViteAssetLoader:
         then plug values from the legacy settings into an app named "default".
         """
 
-        applied_settings = dir(settings)
+        applied_settings = set(dir(settings))
         legacy_settings_keys = cls.LEGACY_DJANGO_VITE_SETTINGS.keys()
         applied_legacy_settings = [
             key for key in legacy_settings_keys if key in applied_settings
@@ -1,6 +1,13 @@
+import socket
+
 import pytest
 
-from django_vite.core.asset_loader import DjangoViteConfig, ManifestClient
+from django_vite.core import asset_loader
+from django_vite.core.asset_loader import (
+    DjangoViteAppClient,
+    DjangoViteConfig,
+    ManifestClient,
+)
 from django_vite.templatetags.django_vite import DjangoViteAssetLoader
 from django_vite.apps import check_loader_instance
 
@@ -148,3 +155,213 @@ def test_parse_manifest_during_dev_mode(dev_mode_true):
 def test_load_dynamic_import_manifest(patch_settings):
     warnings = check_loader_instance()
     assert len(warnings) == 0
+
+
+def test_vite_is_serving_caches_probe(monkeypatch):
+    calls = []
+
+    def fake_probe(config):
+        calls.append(config)
+        return True
+
+    monkeypatch.setattr(asset_loader, "_probe_vite_server", fake_probe)
+    monkeypatch.setattr(asset_loader, "_vite_is_serving_cache", {})
+
+    config = DjangoViteConfig(dev_mode=True)
+    assert asset_loader.vite_is_serving(config)
+    assert asset_loader.vite_is_serving(config)
+    assert len(calls) == 1
+
+    assert asset_loader.vite_is_serving(config._replace(dev_server_port=5174))
+    assert len(calls) == 2
+
+
+def test_manifest_entries_are_built_lazily(dev_mode_false):
+    manifest_client = DjangoViteAssetLoader.instance()._apps["default"].manifest
+    assert "src/entry.ts" in manifest_client._raw_entries
+    assert "src/entry.ts" not in manifest_client._entries
+
+    manifest_entry = manifest_client.get("src/entry.ts")
+    assert manifest_entry.file == "assets/entry-29e38a60.js"
+    assert manifest_client.get("src/entry.ts") is manifest_entry
+
+
+def test_css_of_shared_imports_are_walked_once(dev_mode_false, monkeypatch):
+    app_client = DjangoViteAssetLoader.instance()._apps["default"]
+    manifest_client = app_client.manifest
+    monkeypatch.setattr(manifest_client, "_entries", {})
+    monkeypatch.setattr(
+        manifest_client,
+        "_raw_entries",
+        {
+            "main.js": {"file": "main.js", "imports": ["_a.js", "_b.js"]},
+            "_a.js": {"file": "a.js", "imports": ["_shared.js"], "css": ["a.css"]},
+            "_b.js": {"file": "b.js", "imports": ["_shared.js"], "css": ["b.css"]},
+            "_shared.js": {"file": "shared.js", "css": ["shared.css"]},
+        },
+    )
+
+    looked_up = []
+    original_get = manifest_client.get
+
+    def get(path):
+        looked_up.append(path)
+        return original_get(path)
+
+    monkeypatch.setattr(manifest_client, "get", get)
+
+    tags = list(app_client._load_css_files_of_asset("main.js"))
+    assert tags == [
+        '<link rel="stylesheet" href="shared.css" />',
+        '<link rel="stylesheet" href="a.css" />',
+        '<link rel="stylesheet" href="b.css" />',
+    ]
+    assert looked_up.count("_shared.js") == 1
+
+
+@pytest.mark.parametrize(
+    ("manifest_path", "is_url"),
+    [
+        ("http://localhost:8000/static/manifest.json", True),
+        ("https://cdn.example.com/manifest.json", True),
+        ("http_local_backup/manifest.json", False),
+    ],
+)
+def test_clean_manifest_path_detects_urls(manifest_path, is_url, monkeypatch):
+    def fake_open_manifest(path_to_manifest):
+        raise FileNotFoundError(path_to_manifest)
+
+    monkeypatch.setattr(asset_loader, "open_manifest", fake_open_manifest)
+
+    config = DjangoViteConfig(dev_mode=False, manifest_path=manifest_path)
+    manifest_client = ManifestClient(config)
+    assert isinstance(manifest_client.manifest_path, str) == is_url
+
+
+def test_probe_vite_server_detects_listening_port():
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        port = server.getsockname()[1]
+        config = DjangoViteConfig(dev_server_host="127.0.0.1", dev_server_port=port)
+        assert asset_loader._probe_vite_server(config)
+
+
+def test_probe_vite_server_connection_refused(monkeypatch):
+    def create_connection(address, timeout=None):
+        raise ConnectionRefusedError(address)
+
+    monkeypatch.setattr(socket, "create_connection", create_connection)
+
+    assert not asset_loader._probe_vite_server(DjangoViteConfig(dev_mode=True))
+
+
+@pytest.mark.parametrize(
+    "manifest_content",
+    ['{"a.js": {"src": "a.js"}}', '{"a.js": 5}', "[]", '"str"'],
+)
+def test_check_warns_on_malformed_manifest(manifest_content, tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(manifest_content)
+    manifest_client = ManifestClient(
+        DjangoViteConfig(dev_mode=False, manifest_path=manifest_path)
+    )
+
+    warnings = manifest_client.check()
+    assert len(warnings) == 1
+    assert "Cannot read Vite manifest file" in str(warnings[0].msg)
+
+
+@pytest.mark.parametrize(
+    ("path", "expected_url"),
+    [
+        ("src/entry.ts", "http://localhost:5173/static/src/entry.ts"),
+        ("/src/entry.ts", "http://localhost:5173/src/entry.ts"),
+        ("../src/entry.ts", "http://localhost:5173/src/entry.ts"),
+        ("a//b.js", "http://localhost:5173/static/a/b.js"),
+        ("c:foo", "c:foo"),
+        ("data:text/js,1", "data:text/js,1"),
+        ("http://cdn.example.com/x.js", "http://cdn.example.com/x.js"),
+    ],
+)
+def test_get_dev_server_url(path, expected_url):
+    app_client = DjangoViteAppClient(
+        DjangoViteConfig(dev_mode=True, static_url_prefix="static")
+    )
+    assert app_client._get_dev_server_url(path) == expected_url
+
+
+def test_manifest_entries_without_url_resolver_use_raw_paths(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text('{"a.js": {"file": "a.js", "css": ["a.css"]}}')
+    manifest_client = ManifestClient(
+        DjangoViteConfig(dev_mode=False, manifest_path=manifest_path)
+    )
+
+    manifest_entry = manifest_client.get("a.js")
+    assert manifest_entry.resolved_file_url == "a.js"
+
+
+def test_multiple_apps_keep_settings_order(patch_settings, settings):
+    patch_settings(
+        {
+            "DJANGO_VITE": {
+                "external_vue_app": {
+                    "dev_mode": False,
+                    "static_url_prefix": "custom/prefix",
+                    "manifest_path": settings.STATIC_ROOT.parent
+                    / "external_vue_app"
+                    / "manifest.json",
+                },
+                "default": {
+                    "dev_mode": False,
+                },
+                "missing_manifest_app": {
+                    "dev_mode": False,
+                    "manifest_path": "fake.json",
+                },
+            }
+        }
+    )
+    loader = DjangoViteAssetLoader.instance()
+
+    assert list(loader._apps) == [
+        "external_vue_app",
+        "default",
+        "missing_manifest_app",
+    ]
+    assert loader.generate_vite_asset_url("src/entry.js", "external_vue_app") == (
+        "custom/prefix/assets/entry-5c085aac.js"
+    )
+    assert loader.generate_vite_asset_url("src/entry.ts", "default") == (
+        "assets/entry-29e38a60.js"
+    )
+    assert len(loader.check()) == 1
+
+
+def test_manifest_client_url_resolver_errors(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(
+        '{"a.js": {"file": "a.js", "css": ["a.css"]}, "b.js": {"file": "b.js"}}'
+    )
+    resolved = []
+
+    def url_resolver(path):
+        resolved.append(path)
+        if path == "b.js":
+            raise ValueError(f"Missing staticfiles manifest entry for {path}")
+        return f"/static/{path}"
+
+    manifest_client = ManifestClient(
+        DjangoViteConfig(dev_mode=False, manifest_path=manifest_path),
+        url_resolver=url_resolver,
+    )
+
+    # CSS URLs are only resolved when rendering CSS tags.
+    assert manifest_client.get("a.js").resolved_file_url == "/static/a.js"
+    assert resolved == ["a.js"]
+
+    # Resolver errors are raised as they are, and the entry isn't memoized.
+    with pytest.raises(ValueError, match="Missing staticfiles manifest entry"):
+        manifest_client.get("b.js")
+    assert "b.js" not in manifest_client._entries